@@ -1,42 +1,81 @@
-import argparse
+import functools
 import json
 import os
 import re
-import shutil
+import stat
 import subprocess
 import sys
+from collections.abc import Iterator
 from pathlib import Path
+from types import SimpleNamespace
+
+
+IS_NATIVE_WINDOWS = sys.platform == "win32"
 
 
 def is_native_windows() -> bool:
     """Check if running on native Windows (not WSL)."""
-    return sys.platform == "win32"
+    return IS_NATIVE_WINDOWS
+
+
+_SLASH_TR = str.maketrans("\\", "/")
+
+
+def _is_drive_letter(c: str) -> bool:
+    return c.isascii() and c.isalpha()
+
+
+def _split_drive_path(path: str) -> tuple[str, str] | None:
+    """Split a Windows drive path into (drive, rest with forward slashes).
+
+    C:\\r\\foo -> ("C", "r/foo"). Returns None for anything else.
+    """
+    if len(path) >= 3 and path[1] == ":" and path[2] in "/\\" and _is_drive_letter(path[0]):
+        return path[0], path[3:].translate(_SLASH_TR)
+    return None
 
 
+@functools.lru_cache(maxsize=1)
 def get_windows_home() -> Path:
     """Get the Windows user home directory."""
-    if is_native_windows():
+    if IS_NATIVE_WINDOWS:
         return Path.home()
-    # WSL: get Windows home via cmd.exe
-    result = subprocess.run(
-        ["cmd.exe", "/c", "echo", "%USERPROFILE%"],
-        capture_output=True,
-        text=True,
-    )
-    if result.returncode == 0:
-        win_path = result.stdout.strip()
-        # Convert Windows path to WSL path
-        wsl_result = subprocess.run(
-            ["wslpath", "-u", win_path],
+    # WSL: USERPROFILE is only visible here when shared through WSLENV;
+    # with the /p flag it is already translated to a WSL path
+    win_path = os.environ.get("USERPROFILE")
+    if win_path and win_path.startswith("/"):
+        return Path(win_path)
+    if not win_path:
+        # Get Windows home via cmd.exe
+        result = subprocess.run(
+            ["cmd.exe", "/c", "echo", "%USERPROFILE%"],
             capture_output=True,
             text=True,
         )
-        if wsl_result.returncode == 0:
-            return Path(wsl_result.stdout.strip())
+        if result.returncode != 0:
+            # Fallback to WSL home
+            return Path.home()
+        win_path = result.stdout.strip()
+    # Drive paths map onto the default /mnt automount directly; anything
+    # else (UNC shares, a custom automount root) goes through wslpath
+    drive_path = _split_drive_path(win_path)
+    if drive_path is not None:
+        home = Path(f"/mnt/{drive_path[0].lower()}/{drive_path[1]}")
+        if home.is_dir():
+            return home
+    # Convert Windows path to WSL path
+    wsl_result = subprocess.run(
+        ["wslpath", "-u", win_path],
+        capture_output=True,
+        text=True,
+    )
+    if wsl_result.returncode == 0:
+        return Path(wsl_result.stdout.strip())
     # Fallback to WSL home
     return Path.home()
 
 
+@functools.lru_cache(maxsize=1)
 def get_weaseltree_config() -> Path:
     """Get the path to the .weaseltree.json config file on Windows side."""
     return get_windows_home() / ".weaseltree.json"
@@ -48,22 +87,28 @@ def extract_relative_path(path: str) -> str | None:
     WSL: /mnt/c/r/foo/bar -> r/foo/bar
     Windows: C:\\r\\foo\\bar -> r/foo/bar
     """
+    # Plain prefix checks rather than regexes: this runs on every command
     # WSL path
-    match = re.match(r"^/mnt/[a-zA-Z]/(.*)$", path)
-    if match:
-        return match.group(1)
+    if path.startswith("/mnt/") and len(path) >= 7 and path[6] == "/" and _is_drive_letter(path[5]):
+        return path[7:]
     # Native Windows path
-    match = re.match(r"^[a-zA-Z]:[/\\](.*)$", path)
-    if match:
-        return match.group(1).replace("\\", "/")
+    drive_path = _split_drive_path(path)
+    if drive_path is not None:
+        return drive_path[1]
     return None
 
 
+# Environment for read-only git queries: don't take optional locks (e.g.
+# git status refreshing the index) and never block on a prompt.
+_GIT_ENV = {**os.environ, "GIT_OPTIONAL_LOCKS": "0", "GIT_TERMINAL_PROMPT": "0"}
+
+
 def get_git_toplevel(cwd=None) -> str | None:
     """Get the root directory of the current git repository."""
     result = subprocess.run(
         ["git", "rev-parse", "--show-toplevel"],
         capture_output=True,
+        env=_GIT_ENV,
         text=True,
         cwd=cwd,
     )
@@ -74,9 +119,84 @@ def get_git_toplevel(cwd=None) -> str | None:
 
 def get_current_branch(cwd=None) -> str | None:
     """Get the current git branch name."""
+    return _get_current_branch(cwd or os.getcwd())
+
+
+def get_git_dir(repo: str) -> str | None:
+    """Get the git directory of the repository rooted at repo, without spawning git.
+
+    Follows the 'gitdir:' pointer used by worktrees and submodules. Returns
+    None if repo is not a repository root.
+    """
+    git_path = os.path.join(repo, ".git")
+    if os.path.isdir(git_path):
+        return git_path
+    # .git is a file pointing at the real git directory
+    try:
+        with open(git_path) as f:
+            gitdir = f.read().strip()
+    except OSError:
+        return None
+    if not gitdir.startswith("gitdir: "):
+        return None
+    return os.path.join(repo, gitdir[len("gitdir: "):])
+
+
+def read_git_head(repo: str) -> str | None:
+    """Read the HEAD file of the repository rooted at repo, without spawning git.
+
+    Returns None if repo is not a repository root or HEAD can't be read.
+    """
+    git_dir = get_git_dir(repo)
+    if git_dir is None:
+        return None
+    try:
+        with open(os.path.join(git_dir, "HEAD")) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def read_git_ref(repo: str, ref: str) -> str | None:
+    """Read the object id of ref (e.g. refs/heads/main) without spawning git.
+
+    Looks at the loose ref file, then packed-refs. Returns None if the ref
+    can't be found that way, e.g. when .git is not a directory.
+    """
+    git_dir = os.path.join(repo, ".git")
+    try:
+        with open(os.path.join(git_dir, ref)) as f:
+            oid = f.read().strip()
+        return None if oid.startswith("ref: ") else oid
+    except OSError:
+        pass
+    try:
+        with open(os.path.join(git_dir, "packed-refs")) as f:
+            for line in f:
+                oid, _, name = line.rstrip("\n").partition(" ")
+                if name == ref:
+                    return oid
+    except OSError:
+        pass
+    return None
+
+
+# HEAD doesn't move under us within one command, so remember it per repo
+@functools.lru_cache(maxsize=8)
+def _get_current_branch(cwd: str) -> str | None:
+    head = read_git_head(cwd)
+    # Reftable repos keep a stub HEAD pointing at the (invalid) branch
+    # name '.invalid'; the real HEAD lives in the reftable, so ask git
+    if head is not None and head != "ref: refs/heads/.invalid":
+        if head.startswith("ref: refs/heads/"):
+            return head[len("ref: refs/heads/"):]
+        if not head.startswith("ref: "):
+            return None  # Detached HEAD
+    # Not a repository root, or HEAD is something unusual: ask git
     result = subprocess.run(
         ["git", "rev-parse", "--abbrev-ref", "HEAD"],
         capture_output=True,
+        env=_GIT_ENV,
         text=True,
         cwd=cwd,
     )
@@ -87,20 +207,74 @@ def get_current_branch(cwd=None) -> str | None:
     return None
 
 
+def get_git_info(cwd=None) -> tuple[str | None, str | None]:
+    """Get (toplevel, branch) of a git repository with a single git call.
+
+    branch is None in detached HEAD state.
+    """
+    result = subprocess.run(
+        ["git", "rev-parse", "--show-toplevel", "--abbrev-ref", "HEAD"],
+        capture_output=True,
+        env=_GIT_ENV,
+        text=True,
+        cwd=cwd,
+    )
+    if result.returncode != 0:
+        # HEAD can't be resolved (e.g. no commits yet); toplevel may still work
+        return get_git_toplevel(cwd), None
+    toplevel, branch = result.stdout.splitlines()[:2]
+    if branch == "HEAD":  # Detached HEAD state
+        branch = None
+    return toplevel, branch
+
+
+# Parsed config keyed by (path, mtime_ns), so repeated lookups within one
+# command don't re-read the file. Also holds the path lookups built by
+# index_config().
+_config_cache: tuple[Path, int, dict, dict] | None = None
+
+
+def index_config(config: dict) -> dict[str, dict[str, tuple[str, dict]]]:
+    """Build {field: {path: (relative_path, entry)}} for wsl_path and windows_path."""
+    index = {"wsl_path": {}, "windows_path": {}}
+    for key, entry in config.items():
+        if isinstance(entry, dict):
+            for field, lookup in index.items():
+                # First entry wins, like a linear scan would
+                lookup.setdefault(entry.get(field), (key, entry))
+    return index
+
+
+def load_config_and_index() -> tuple[dict, dict]:
+    """Load the full config and its path lookups (see index_config)."""
+    global _config_cache
+    config_path = get_weaseltree_config()
+    try:
+        mtime = config_path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return {}, index_config({})
+    if _config_cache is not None and _config_cache[:2] == (config_path, mtime):
+        return _config_cache[2:]
+    config = json.loads(config_path.read_bytes())
+    _config_cache = (config_path, mtime, config, index_config(config))
+    return _config_cache[2:]
+
+
 def load_config() -> dict:
     """Load the full config from JSON file."""
-    config_path = get_weaseltree_config()
-    if config_path.exists():
-        with open(config_path) as f:
-            return json.load(f)
-    return {}
+    return load_config_and_index()[0]
 
 
 def save_config(config: dict):
     """Save the full config to JSON file."""
+    global _config_cache
     config_path = get_weaseltree_config()
-    with open(config_path, "w") as f:
-        json.dump(config, f, indent=2)
+    # Write to a temporary file and rename it over the config, so a crash
+    # mid-write can't leave a truncated config behind
+    tmp_path = config_path.with_name(config_path.name + ".tmp")
+    tmp_path.write_bytes(json.dumps(config, indent=2).encode())
+    os.replace(tmp_path, config_path)
+    _config_cache = (config_path, config_path.stat().st_mtime_ns, config, index_config(config))
 
 
 def save_repo_config(relative_path: str, branch: str, windows_path: str, wsl_path: str):
@@ -122,25 +296,17 @@ def load_repo_config(relative_path: str) -> dict | None:
 
 def find_config_by_wsl_path(wsl_path: str) -> tuple[str, dict] | None:
     """Find repo config by WSL path. Returns (relative_path, config) or None."""
-    config = load_config()
-    for key, entry in config.items():
-        if isinstance(entry, dict) and entry.get("wsl_path") == wsl_path:
-            return (key, entry)
-    return None
+    return load_config_and_index()[1]["wsl_path"].get(wsl_path)
 
 
 def find_config_by_windows_path(windows_path: str) -> tuple[str, dict] | None:
     """Find repo config by Windows path. Returns (relative_path, config) or None."""
-    config = load_config()
-    for key, entry in config.items():
-        if isinstance(entry, dict) and entry.get("windows_path") == windows_path:
-            return (key, entry)
-    return None
+    return load_config_and_index()[1]["windows_path"].get(windows_path)
 
 
-def resolve_config() -> tuple[str, dict]:
+def resolve_config(toplevel: str | None = None) -> tuple[str, dict]:
     """Resolve config from current directory. Returns (relative_path, config) or exits."""
-    cwd = get_git_toplevel() or os.getcwd()
+    cwd = toplevel or get_git_toplevel() or os.getcwd()
 
     # Try Windows side first (/mnt/c/...)
     relative_path = extract_relative_path(cwd)
@@ -159,7 +325,7 @@ def resolve_config() -> tuple[str, dict]:
     sys.exit(1)
 
 
-def setup_link(wsl_path: str, windows_path: str):
+def setup_link(wsl_path: str, windows_path: str, current_branch: str | None = None):
     """Set up the link between a WSL repo and its Windows counterpart."""
     windows_path = str(Path(windows_path).resolve())
 
@@ -172,7 +338,8 @@ def setup_link(wsl_path: str, windows_path: str):
         print(f"Error: Not a git repository: {windows_path}", file=sys.stderr)
         sys.exit(1)
 
-    current_branch = get_current_branch(wsl_path)
+    if current_branch is None:
+        current_branch = get_current_branch(wsl_path)
     if current_branch is None:
         print("Error: Not on a branch (detached HEAD?)", file=sys.stderr)
         sys.exit(1)
@@ -184,7 +351,8 @@ def setup_link(wsl_path: str, windows_path: str):
 
 def link_command(args):
     """Link a WSL repo to its Windows counterpart."""
-    cwd = get_git_toplevel() or os.getcwd()
+    toplevel, current_branch = get_git_info()
+    cwd = toplevel or os.getcwd()
 
     if extract_relative_path(cwd) is not None:
         print("Error: Run 'weaseltree link' from the WSL side, not /mnt/", file=sys.stderr)
@@ -194,7 +362,10 @@ def link_command(args):
         print(f"Error: Not a git repository: {cwd}", file=sys.stderr)
         sys.exit(1)
 
-    setup_link(cwd, args.windows_path)
+    setup_link(cwd, args.windows_path, current_branch)
+
+
+_HTTP_URL_RE = re.compile(r"^https?://([^/]+)/(.+)$")
 
 
 def http_to_ssh(url: str) -> str:
@@ -202,7 +373,7 @@ def http_to_ssh(url: str) -> str:
 
     https://github.com/user/repo.git -> git@github.com:user/repo.git
     """
-    match = re.match(r"^https?://([^/]+)/(.+)$", url)
+    match = _HTTP_URL_RE.match(url)
     if match:
         host = match.group(1)
         path = match.group(2)
@@ -228,6 +399,7 @@ def clone_command(args):
         ["git", "remote", "get-url", "origin"],
         cwd=windows_path,
         capture_output=True,
+        env=_GIT_ENV,
         text=True,
     )
     if result.returncode != 0:
@@ -285,13 +457,15 @@ def clone_command(args):
 
 def sync_command(args):
     """Push WSL branch to origin and pull on Windows side."""
-    relative_path, config = resolve_config()
+    toplevel, current_branch = get_git_info()
+    relative_path, config = resolve_config(toplevel)
 
     wsl_path = config["wsl_path"]
     windows_path = config["windows_path"]
 
-    # Detect branch changes on WSL side
-    current_branch = get_current_branch(wsl_path)
+    # Detect branch changes on WSL side (already known when run from there)
+    if toplevel != wsl_path:
+        current_branch = get_current_branch(wsl_path)
     if current_branch and current_branch != config["branch"]:
         print(f"Branch changed: {config['branch']} -> {current_branch}")
         config["branch"] = current_branch
@@ -310,13 +484,28 @@ def sync_command(args):
         print(f"Error pushing to origin: {e}", file=sys.stderr)
         sys.exit(1)
 
-    # Checkout and pull on Windows side
+    # Nothing to do on Windows side if it already has the branch checked
+    # out at the commit just pushed (e.g. sync run twice in a row)
+    windows_branch = get_current_branch(windows_path)
+    windows_commit = read_git_ref(windows_path, f"refs/heads/{branch}")
+    if (
+        windows_branch == branch
+        and windows_commit is not None
+        and windows_commit == read_git_ref(wsl_path, f"refs/heads/{branch}")
+    ):
+        print(f"Windows side already up to date on '{branch}'")
+        return
+
+    # Checkout and pull on Windows side. Every git.exe start crosses the
+    # WSL interop boundary, so skip the checkout if HEAD (read from the
+    # file, no git needed) already names the branch.
     try:
-        subprocess.run(
-            ["git.exe", "checkout", branch],
-            cwd=windows_path,
-            check=True,
-        )
+        if windows_branch != branch:
+            subprocess.run(
+                ["git.exe", "checkout", branch],
+                cwd=windows_path,
+                check=True,
+            )
         subprocess.run(
             ["git.exe", "pull", "--ff-only", "origin", branch],
             cwd=windows_path,
@@ -380,8 +569,201 @@ def pull_command(args):
     print(f"Updated '{branch}' from origin")
 
 
+def fast_copy(src: str, dst: str):
+    """Copy src to dst inside the kernel, preserving mode like shutil.copy."""
+    import shutil
+
+    st = os.stat(src)
+    remaining = st.st_size
+    try:
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            while remaining > 0:
+                n = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                if n == 0:
+                    # Some filesystems (FUSE, 9p) report 0 rather than an
+                    # error when they can't do it
+                    break
+                remaining -= n
+    except OSError:
+        # EXDEV etc. when crossing into drvfs
+        remaining = -1
+    if remaining != 0:
+        # copyfile falls back to sendfile
+        shutil.copyfile(src, dst)
+    os.chmod(dst, st.st_mode & 0o7777)
+
+
+def write_if_changed(dst: str, content: bytes, dst_size: int | None) -> bool:
+    """Write content to dst unless dst already holds exactly that content.
+
+    dst_size is the current size of dst, or None if it doesn't exist.
+    Returns True if the file was written.
+    """
+    if dst_size == len(content):
+        with open(dst, "rb") as f:
+            if f.read() == content:
+                return False
+    with open(dst, "wb") as f:
+        f.write(content)
+    return True
+
+
+def iter_status(stream) -> Iterator[tuple[str, str]]:
+    """Parse 'git status --porcelain=v2 -z' output into (status, path) pairs.
+
+    Records are yielded as they arrive on stream, so callers can start
+    working while git is still scanning. status uses the porcelain v1
+    two-letter notation (' ' for unchanged, '??' for untracked). Paths are
+    relative to the repository root.
+    """
+    pending = b""
+    skip_source = False
+    while chunk := stream.read1(65536):
+        records = (pending + chunk).split(b"\x00")
+        pending = records.pop()  # Incomplete until the next NUL
+        for record in records:
+            if skip_source:
+                # The rename/copy source path following a '2' record
+                skip_source = False
+                continue
+            kind = record[:1]
+            if kind == b"1":
+                status, path = record[2:4], record.split(b" ", 8)[8]
+            elif kind == b"2":
+                status, path = record[2:4], record.split(b" ", 9)[9]
+                skip_source = True
+            elif kind == b"u":
+                status, path = record[2:4], record.split(b" ", 10)[10]
+            elif kind == b"?":
+                status, path = b"??", record[2:]
+            else:
+                continue
+            yield status.decode().replace(".", " "), os.fsdecode(path)
+
+
+# File in the WSL repo's git directory remembering what the last 'up' copied
+UP_STATE_FILE = "weaseltree-up.json"
+
+
+def load_up_state(git_dir: str, windows_path: str) -> dict[str, list[int]]:
+    """Load {path: [src_mtime_ns, dst_mtime_ns]} recorded by the last up run.
+
+    Returns an empty dict if there is no state, it can't be read, or it was
+    recorded for a different Windows path.
+    """
+    try:
+        state = json.loads(Path(git_dir, UP_STATE_FILE).read_bytes())
+    except (OSError, ValueError):
+        return {}
+    if state.get("windows_path") != windows_path:
+        return {}
+    return state.get("files", {})
+
+
+def save_up_state(git_dir: str, windows_path: str, files: dict[str, list[int]]):
+    """Save the mtimes recorded by an up run (see load_up_state)."""
+    data = {"windows_path": windows_path, "files": files}
+    Path(git_dir, UP_STATE_FILE).write_bytes(json.dumps(data).encode())
+
+
+def copy_one(
+    src: str,
+    dst: str,
+    status: str,
+    last: list[int] | None = None,
+    made_dirs: set[str] | None = None,
+) -> tuple[str | None, list[int] | None]:
+    """Mirror one changed file from src to dst.
+
+    last is the [src_mtime_ns, dst_mtime_ns] pair recorded when the file
+    was last mirrored. If neither file has been modified since, the copy
+    is skipped without reading either file. dst keeps its own mtime, so
+    Windows-side builds see the update as new.
+
+    made_dirs, when shared between calls, remembers the destination
+    directories already created.
+
+    Returns (outcome, pair): outcome is "copied", "deleted", "unchanged",
+    or None when there was nothing to do; pair is the mtime pair to record
+    for the next run, or None.
+    """
+    # Handle deletions
+    if status.strip() == "D":
+        try:
+            os.unlink(dst)
+        except FileNotFoundError:
+            return None, None
+        return "deleted", None
+
+    try:
+        src_stat = os.stat(src)
+    except FileNotFoundError:
+        return None, None
+    if stat.S_ISDIR(src_stat.st_mode):
+        return None, None
+
+    # Stat the destination once; every check below reuses it
+    try:
+        dst_stat = os.stat(dst)
+    except FileNotFoundError:
+        dst_stat = None
+
+    if dst_stat is not None and last == [src_stat.st_mtime_ns, dst_stat.st_mtime_ns]:
+        return "unchanged", last
+
+    # Create parent directories if needed
+    parent = os.path.dirname(dst)
+    if dst_stat is None and (made_dirs is None or parent not in made_dirs):
+        # Racing threads may both get here; exist_ok makes that harmless
+        os.makedirs(parent, exist_ok=True)
+        if made_dirs is not None:
+            made_dirs.add(parent)
+
+    # Copy file, preserving target line endings if it exists
+    try:
+        with open(src, "rb") as f:
+            src_content = f.read(8192)
+            # Check if binary (null bytes near the start, as git decides)
+            binary = b'\x00' in src_content
+            if not binary:
+                src_content += f.read()
+        if binary:
+            # Copied as-is, so let the kernel move the data
+            fast_copy(src, dst)
+            return "copied", [src_stat.st_mtime_ns, os.stat(dst).st_mtime_ns]
+
+        # Text file - check target line endings
+        use_crlf = False
+        if dst_stat is not None:
+            try:
+                with open(dst, 'rb') as f:
+                    chunk = f.read(8192)
+                    if b'\r\n' in chunk:
+                        use_crlf = True
+            except Exception:
+                pass
+
+        if use_crlf:
+            # Normalize to LF (only needed if there are CRs) then convert to CRLF
+            if b'\r' in src_content:
+                src_content = src_content.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+            src_content = src_content.replace(b'\n', b'\r\n')
+
+        written = write_if_changed(dst, src_content, dst_stat.st_size if dst_stat else None)
+    except Exception:
+        # Fallback to simple copy
+        fast_copy(src, dst)
+        written = True
+
+    if not written:
+        return "unchanged", [src_stat.st_mtime_ns, dst_stat.st_mtime_ns]
+    return "copied", [src_stat.st_mtime_ns, os.stat(dst).st_mtime_ns]
+
+
 def up_command(args):
     """Copy uncommitted changes from WSL to Windows side."""
+    import concurrent.futures
+
     cwd = get_git_toplevel() or os.getcwd()
 
     # Must be on WSL side (lookup by wsl_path)
@@ -391,86 +773,87 @@ def up_command(args):
         sys.exit(1)
 
     _, config = result
-    windows_path = Path(config["windows_path"])
+    windows_path = config["windows_path"]
 
-    # Get list of changed files (modified, added, untracked)
-    result = subprocess.run(
-        ["git", "status", "--porcelain"],
-        capture_output=True,
-        text=True,
+    # mtimes recorded by the last run, to skip files that haven't changed
+    # on either side since (--force copies them regardless)
+    git_dir = get_git_dir(cwd)
+    last_state = {}
+    if git_dir is not None and not getattr(args, "force", False):
+        last_state = load_up_state(git_dir, windows_path)
+
+    # Stream changed files (modified, added, untracked) from git status and
+    # start copying while it is still running. Copies across /mnt/ are
+    # latency-bound, so they run concurrently.
+    proc = subprocess.Popen(
+        # Submodules can't be copied as files anyway, so don't make git
+        # recurse into each of them to compute their status
+        ["git", "status", "--porcelain=v2", "-z", "--ignore-submodules=all"],
+        stdout=subprocess.PIPE,
+        cwd=cwd,
+        env=_GIT_ENV,
     )
-    if result.returncode != 0:
-        print(f"Error running git status: {result.stderr}", file=sys.stderr)
-        sys.exit(1)
+    filepaths = []
+    futures = []
+    made_dirs = set()
+    max_workers = min(32, (os.cpu_count() or 1) * 4)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as ex:
+        with proc.stdout:
+            for status, filepath in iter_status(proc.stdout):
+                filepaths.append(filepath)
+                futures.append(ex.submit(
+                    copy_one,
+                    os.path.join(cwd, filepath),
+                    os.path.join(windows_path, filepath),
+                    status,
+                    last=last_state.get(filepath),
+                    made_dirs=made_dirs,
+                ))
+        if proc.wait() != 0:
+            print("Error running git status", file=sys.stderr)
+            sys.exit(1)
 
-    lines = result.stdout.splitlines()
-    if not lines:
+    if not futures:
         print("No changes to copy")
         return
 
     copied = 0
     deleted = 0
-    for line in lines:
-        if not line:
-            continue
-        status = line[:2]
-        filepath = line[3:]
-
-        # Handle renames (R oldname -> newname)
-        if " -> " in filepath:
-            filepath = filepath.split(" -> ")[1]
-
-        src = Path(cwd) / filepath
-        dst = windows_path / filepath
-
-        # Handle deletions
-        if status.strip() == "D":
-            if dst.exists():
-                dst.unlink()
-                print(f"  Deleted: {filepath}")
-                deleted += 1
-            continue
-
-        if not src.exists() or src.is_dir():
-            continue
-
-        # Create parent directories if needed
-        dst.parent.mkdir(parents=True, exist_ok=True)
-
-        # Copy file, preserving target line endings if it exists
+    unchanged = 0
+    failed = 0
+    # Collect the per-file lines and write them in one go
+    lines = []
+    state = {}
+    for filepath, future in zip(filepaths, futures):
         try:
-            src_content = src.read_bytes()
-            # Check if binary (contains null bytes)
-            if b'\x00' in src_content:
-                dst.write_bytes(src_content)
-            else:
-                # Text file - check target line endings
-                use_crlf = False
-                if dst.exists():
-                    try:
-                        with open(dst, 'rb') as f:
-                            chunk = f.read(8192)
-                            if b'\r\n' in chunk:
-                                use_crlf = True
-                    except Exception:
-                        pass
-
-                if use_crlf:
-                    # Normalize to LF then convert to CRLF
-                    src_content = src_content.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
-                    src_content = src_content.replace(b'\n', b'\r\n')
-
-                dst.write_bytes(src_content)
-        except Exception:
-            # Fallback to simple copy
-            shutil.copy2(src, dst)
-
-        print(f"  Copied: {filepath}")
-        copied += 1
+            outcome, pair = future.result()
+        except OSError as e:
+            # e.g. a file locked by a Windows editor; report it and carry on
+            lines.append(f"  Failed: {filepath}: {e}\n")
+            failed += 1
+            continue
+        if pair is not None:
+            state[filepath] = pair
+        if outcome == "copied":
+            lines.append(f"  Copied: {filepath}\n")
+            copied += 1
+        elif outcome == "deleted":
+            lines.append(f"  Deleted: {filepath}\n")
+            deleted += 1
+        elif outcome == "unchanged":
+            unchanged += 1
+    sys.stdout.write("".join(lines))
+    if git_dir is not None:
+        save_up_state(git_dir, windows_path, state)
 
     print(f"Copied {copied} file(s) to {windows_path}")
     if deleted:
         print(f"Deleted {deleted} file(s)")
+    if unchanged:
+        print(f"Skipped {unchanged} unchanged file(s)")
+    if failed:
+        print(f"Error: Failed to copy {failed} file(s)", file=sys.stderr)
+        sys.exit(1)
 
 
 def list_command(args):
@@ -522,24 +905,32 @@ def run_command(args):
     if subdir != ".":
         windows_path = str(Path(windows_path) / subdir)
 
-    result = subprocess.run(["cmd.exe", "/c"] + args.cmd, cwd=windows_path)
-    sys.exit(result.returncode)
+    # Replace this process with cmd.exe: it inherits the terminal directly
+    # and its exit code becomes ours, without waiting on a Python parent
+    os.chdir(windows_path)
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os.execvp("cmd.exe", ["cmd.exe", "/c"] + args.cmd)
+
+
+HELP = """\
+weaseltree - WSL git sync helper
+
+Commands:
+  clone  Clone a Windows repo's remote to WSL and link
+  link   Link an existing WSL repo to its Windows counterpart
+  sync   Push to origin and pull on Windows side
+  up     Copy uncommitted changes from WSL to Windows
+  push   Push the branch to origin
+  pull   Pull from origin on both sides
+  list   List all managed directories
+  run    Run a command on the Windows side
+"""
 
 
 def show_status():
     """Show available commands and current repository status."""
-    print("weaseltree - WSL git sync helper")
-    print()
-    print("Commands:")
-    print("  clone  Clone a Windows repo's remote to WSL and link")
-    print("  link   Link an existing WSL repo to its Windows counterpart")
-    print("  sync   Push to origin and pull on Windows side")
-    print("  up     Copy uncommitted changes from WSL to Windows")
-    print("  push   Push the branch to origin")
-    print("  pull   Pull from origin on both sides")
-    print("  list   List all managed directories")
-    print("  run    Run a command on the Windows side")
-    print()
+    print(HELP)
 
     cwd = os.getcwd()
 
@@ -584,15 +975,20 @@ def show_status():
     print(f"  Path: {cwd} (not managed by weaseltree)")
 
 
-def main():
-    if is_native_windows():
-        print("Error: weaseltree must be run from WSL, not Windows", file=sys.stderr)
-        sys.exit(1)
+# Handler for each subcommand
+DISPATCH = {
+    "clone": clone_command,
+    "link": link_command,
+    "sync": sync_command,
+    "push": push_command,
+    "up": up_command,
+    "pull": pull_command,
+    "list": list_command,
+    "run": run_command,
+}
 
-    parser = argparse.ArgumentParser(description="WSL git sync helper")
-    subparsers = parser.add_subparsers(dest="command")
 
-    # clone subcommand
+def add_clone_parser(subparsers):
     clone_parser = subparsers.add_parser(
         "clone", help="Clone a Windows repo's remote to WSL and link them"
     )
@@ -608,9 +1004,9 @@ def main():
         "--remote", default=None,
         help="Override the remote URL (default: auto-convert HTTP to SSH)"
     )
-    clone_parser.set_defaults(func=clone_command)
 
-    # link subcommand
+
+def add_link_parser(subparsers):
     link_parser = subparsers.add_parser(
         "link", help="Link an existing WSL repo to its Windows counterpart"
     )
@@ -618,50 +1014,116 @@ def main():
         "windows_path",
         help="Path to the Windows repo (e.g. /mnt/c/r/myproject)"
     )
-    link_parser.set_defaults(func=link_command)
 
-    # sync subcommand
-    sync_parser = subparsers.add_parser(
+
+def add_sync_parser(subparsers):
+    subparsers.add_parser(
         "sync", help="Push to origin and pull on Windows side"
     )
-    sync_parser.set_defaults(func=sync_command)
 
-    # push subcommand
-    push_parser = subparsers.add_parser(
+
+def add_push_parser(subparsers):
+    subparsers.add_parser(
         "push", help="Push the branch to origin"
     )
-    push_parser.set_defaults(func=push_command)
 
-    # up subcommand
+
+def add_up_parser(subparsers):
     up_parser = subparsers.add_parser(
         "up", help="Copy uncommitted changes from WSL to Windows"
     )
-    up_parser.set_defaults(func=up_command)
+    up_parser.add_argument(
+        "--force", action="store_true",
+        help="Copy files even if the Windows copy looks up to date"
+    )
+
 
-    # pull subcommand
-    pull_parser = subparsers.add_parser(
+def add_pull_parser(subparsers):
+    subparsers.add_parser(
         "pull", help="Pull from origin on both sides"
     )
-    pull_parser.set_defaults(func=pull_command)
 
-    # list subcommand
-    list_parser = subparsers.add_parser(
+
+def add_list_parser(subparsers):
+    subparsers.add_parser(
         "list", help="List all managed directories"
     )
-    list_parser.set_defaults(func=list_command)
 
-    # run subcommand
-    run_parser = subparsers.add_parser(
+
+def add_run_parser(subparsers):
+    # The command to run is sliced off argv by main(), not parsed
+    subparsers.add_parser(
         "run", help="Run a command on the Windows side"
     )
-    run_parser.add_argument("cmd", nargs=argparse.REMAINDER, help="Command to run")
-    run_parser.set_defaults(func=run_command)
 
-    args = parser.parse_args()
+
+# Subparser builders by command name, in help order
+SUBPARSER_BUILDERS = {
+    "clone": add_clone_parser,
+    "link": add_link_parser,
+    "sync": add_sync_parser,
+    "push": add_push_parser,
+    "up": add_up_parser,
+    "pull": add_pull_parser,
+    "list": add_list_parser,
+    "run": add_run_parser,
+}
+
+
+# Commands that can run without any arguments, so a bare 'weaseltree sync'
+# skips argparse. They then get no parser defaults: their handlers must
+# read options with getattr(args, name, default).
+BARE_COMMANDS = {"sync", "push", "up", "pull", "list"}
+
+
+def main():
+    if IS_NATIVE_WINDOWS:
+        print("Error: weaseltree must be run from WSL, not Windows", file=sys.stderr)
+        sys.exit(1)
+
+    # Plain 'weaseltree' only shows status; don't pay for argparse
+    if len(sys.argv) == 1:
+        show_status()
+        return
+    command = sys.argv[1]
+    # Top-level help is fixed text; no need to have argparse format it
+    if len(sys.argv) == 2 and command in ("-h", "--help"):
+        print("usage: weaseltree [<command> [<args>]]")
+        print()
+        print(HELP)
+        print("Run 'weaseltree <command> -h' for the options of a command.")
+        return
+    if len(sys.argv) == 2 and command in BARE_COMMANDS:
+        DISPATCH[command](SimpleNamespace(command=command))
+        return
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="WSL git sync helper")
+    subparsers = parser.add_subparsers(dest="command")
+
+    # Only build the subparser of the command being run. Unknown commands
+    # need all of them, to list the valid choices.
+    if command in SUBPARSER_BUILDERS:
+        # Keep usage and errors listing every command, not just this one
+        subparsers.metavar = "{" + ",".join(SUBPARSER_BUILDERS) + "}"
+        SUBPARSER_BUILDERS[command](subparsers)
+    else:
+        for build in SUBPARSER_BUILDERS.values():
+            build(subparsers)
+
+    # Everything after 'run' is the Windows command line; pass it through
+    # untouched, even if it looks like options
+    argv = sys.argv[1:]
+    if command == "run":
+        args = parser.parse_args(argv[:1])
+        args.cmd = argv[1:]
+    else:
+        args = parser.parse_args(argv)
     if args.command is None:
         show_status()
     else:
-        args.func(args)
+        DISPATCH[args.command](args)
 
 
 if __name__ == "__main__":